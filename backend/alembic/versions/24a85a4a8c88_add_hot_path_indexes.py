@@ -0,0 +1,50 @@
+"""add hot path indexes
+
+Revision ID: 24a85a4a8c88
+Revises: b17d4627ad5b
+Create Date: 2026-10-15 09:12:41.305118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "24a85a4a8c88"
+down_revision: Union[str, Sequence[str], None] = "b17d4627ad5b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SKU check on create: WHERE sku = ? AND is_active
+    op.create_index("ix_products_active_sku", "products", ["is_active", "sku"], unique=False)
+
+    # product list / reorder: WHERE is_active (partial index, only active rows)
+    op.create_index(
+        "ix_products_active",
+        "products",
+        ["is_active"],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+        sqlite_where=sa.text("is_active"),
+    )
+
+    # audit log read: [WHERE product_id = ?] ORDER BY id DESC
+    op.create_index(
+        "ix_audit_product_id_desc",
+        "audit_logs",
+        ["product_id", sa.text("id DESC")],
+        unique=False,
+    )
+    # covered by the composite index above (same leading column)
+    op.drop_index(op.f("ix_audit_logs_product_id"), table_name="audit_logs")
+
+
+def downgrade() -> None:
+    op.create_index(op.f("ix_audit_logs_product_id"), "audit_logs", ["product_id"], unique=False)
+    op.drop_index("ix_audit_product_id_desc", table_name="audit_logs")
+    op.drop_index("ix_products_active", table_name="products")
+    op.drop_index("ix_products_active_sku", table_name="products")
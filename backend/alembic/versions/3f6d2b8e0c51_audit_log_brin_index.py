@@ -0,0 +1,37 @@
+"""audit log brin index
+
+Revision ID: 3f6d2b8e0c51
+Revises: 9e0b7c4d1a26
+Create Date: 2026-10-15 11:20:36.482095
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f6d2b8e0c51"
+down_revision: Union[str, Sequence[str], None] = "9e0b7c4d1a26"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # created_at grows with insert order, so a BRIN index stays tiny on Postgres
+    op.create_index(
+        "ix_audit_logs_created_at_brin",
+        "audit_logs",
+        ["created_at"],
+        unique=False,
+        postgresql_using="brin",
+    )
+
+    # nothing filters audit logs by sku (reads go through product_id)
+    op.drop_index(op.f("ix_audit_logs_sku"), table_name="audit_logs")
+
+
+def downgrade() -> None:
+    op.create_index(op.f("ix_audit_logs_sku"), "audit_logs", ["sku"], unique=False)
+    op.drop_index("ix_audit_logs_created_at_brin", table_name="audit_logs")
@@ -0,0 +1,42 @@
+"""reorder and supplier indexes
+
+Revision ID: 5c1e9a07d3f2
+Revises: bd74481e36eb
+Create Date: 2026-10-15 10:31:54.907316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1e9a07d3f2"
+down_revision: Union[str, Sequence[str], None] = "bd74481e36eb"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # active products by supplier
+    op.create_index("ix_products_active_supplier", "products", ["is_active", "supplier"], unique=False)
+
+    # reorder report: WHERE is_active AND qty <= ... (partial, only active rows)
+    op.create_index(
+        "ix_products_active_lowstock",
+        "products",
+        ["quantity", "safety_stock"],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+        sqlite_where=sa.text("is_active"),
+    )
+
+    # duplicate of the uq_products_sku unique index; one less B-tree per insert
+    op.drop_index("ix_products_sku", table_name="products")
+
+
+def downgrade() -> None:
+    op.create_index("ix_products_sku", "products", ["sku"], unique=False)
+    op.drop_index("ix_products_active_lowstock", table_name="products")
+    op.drop_index("ix_products_active_supplier", table_name="products")
@@ -0,0 +1,35 @@
+"""drop lowstock index
+
+Revision ID: 7b2e4f9a1c08
+Revises: e5a93c0f7d14
+Create Date: 2026-10-15 14:12:27.905841
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7b2e4f9a1c08"
+down_revision: Union[str, Sequence[str], None] = "e5a93c0f7d14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # reorder_query() filters on quantity <= CEIL(demand * lead) + safety_stock,
+    # which this index can't serve (demand/lead aren't in it): write cost only
+    op.drop_index("ix_products_active_lowstock", table_name="products")
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_products_active_lowstock",
+        "products",
+        ["quantity", "safety_stock"],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+        sqlite_where=sa.text("is_active"),
+    )
@@ -0,0 +1,31 @@
+"""drop redundant pk indexes
+
+Revision ID: 9e0b7c4d1a26
+Revises: 5c1e9a07d3f2
+Create Date: 2026-10-15 10:48:09.114672
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9e0b7c4d1a26"
+down_revision: Union[str, Sequence[str], None] = "5c1e9a07d3f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # the primary key is already indexed; these were a second B-tree on id
+    op.drop_index(op.f("ix_products_id"), table_name="products")
+    op.drop_index(op.f("ix_audit_logs_id"), table_name="audit_logs")
+    op.drop_index(op.f("ix_users_id"), table_name="users")
+
+
+def downgrade() -> None:
+    op.create_index(op.f("ix_users_id"), "users", ["id"], unique=False)
+    op.create_index(op.f("ix_audit_logs_id"), "audit_logs", ["id"], unique=False)
+    op.create_index(op.f("ix_products_id"), "products", ["id"], unique=False)
@@ -0,0 +1,39 @@
+"""avg_daily_demand as float
+
+Revision ID: bd74481e36eb
+Revises: 24a85a4a8c88
+Create Date: 2026-10-15 10:02:17.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "bd74481e36eb"
+down_revision: Union[str, Sequence[str], None] = "24a85a4a8c88"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # demand is fractional (1.5 / day); Integer truncated it on Postgres
+    with op.batch_alter_table("products") as batch_op:
+        batch_op.alter_column(
+            "avg_daily_demand",
+            existing_type=sa.Integer(),
+            type_=sa.Float(),
+            existing_nullable=True,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("products") as batch_op:
+        batch_op.alter_column(
+            "avg_daily_demand",
+            existing_type=sa.Float(),
+            type_=sa.Integer(),
+            existing_nullable=True,
+        )
@@ -0,0 +1,68 @@
+"""product server defaults
+
+Revision ID: c84f1e6a2b97
+Revises: 3f6d2b8e0c51
+Create Date: 2026-10-15 12:05:43.270158
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c84f1e6a2b97"
+down_revision: Union[str, Sequence[str], None] = "3f6d2b8e0c51"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # backfill before NOT NULL
+    op.execute("UPDATE products SET is_active = TRUE WHERE is_active IS NULL")
+    op.execute("UPDATE products SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+    op.execute("UPDATE products SET updated_at = created_at WHERE updated_at IS NULL")
+
+    # SQLite-safe batch migration
+    with op.batch_alter_table("products") as batch_op:
+        batch_op.alter_column(
+            "is_active",
+            existing_type=sa.Boolean(),
+            server_default=sa.true(),
+            nullable=False,
+        )
+        batch_op.alter_column(
+            "created_at",
+            existing_type=sa.DateTime(),
+            server_default=sa.func.now(),
+            nullable=False,
+        )
+        batch_op.alter_column(
+            "updated_at",
+            existing_type=sa.DateTime(),
+            server_default=sa.func.now(),
+            nullable=False,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("products") as batch_op:
+        batch_op.alter_column(
+            "updated_at",
+            existing_type=sa.DateTime(),
+            server_default=None,
+            nullable=True,
+        )
+        batch_op.alter_column(
+            "created_at",
+            existing_type=sa.DateTime(),
+            server_default=None,
+            nullable=True,
+        )
+        batch_op.alter_column(
+            "is_active",
+            existing_type=sa.Boolean(),
+            server_default=None,
+            nullable=True,
+        )
@@ -0,0 +1,39 @@
+"""lead_time_days as smallint
+
+Revision ID: e5a93c0f7d14
+Revises: c84f1e6a2b97
+Create Date: 2026-10-15 12:41:08.639520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5a93c0f7d14"
+down_revision: Union[str, Sequence[str], None] = "c84f1e6a2b97"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # lead times are days; INT2 halves the column (fails if a row is > 32767)
+    with op.batch_alter_table("products") as batch_op:
+        batch_op.alter_column(
+            "lead_time_days",
+            existing_type=sa.Integer(),
+            type_=sa.SmallInteger(),
+            existing_nullable=True,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("products") as batch_op:
+        batch_op.alter_column(
+            "lead_time_days",
+            existing_type=sa.SmallInteger(),
+            type_=sa.Integer(),
+            existing_nullable=True,
+        )
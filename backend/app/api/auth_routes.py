@@ -1,16 +1,25 @@
 # backend/app/api/auth_routes.py
 
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
 
-from app.api.deps_auth import get_db, get_current_user
-from app.core.security import verify_password, create_access_token
+from app.api.deps_auth import get_db, get_current_user, get_current_user_db, oauth2_scheme, revoke_token, CurrentUser
+from app.core.security import verify_and_update_password, create_access_token
 from app.models.user import User
 
 router = APIRouter()
 
+# password hashing is CPU-bound: keep it off the event loop, at most one hash per core.
+# argon2-cffi and hashlib's pbkdf2 release the GIL, so these threads hash in parallel.
+_HASH_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="pwhash")
+
 
 class LoginIn(BaseModel):
     username: str
@@ -33,16 +42,35 @@ class LoginOut(BaseModel):
     user: UserOut
 
 
+async def authenticate_user(db: AsyncSession, username: str, password: str) -> User:
+    user = (await db.execute(select(User).where(User.username == username))).scalar_one_or_none()
+
+    ok, new_hash = False, None
+    if user:
+        ok, new_hash = await asyncio.get_running_loop().run_in_executor(
+            _HASH_POOL, verify_and_update_password, password, user.password_hash
+        )
+    if not ok:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid username or password")
+
+    # upgrade legacy pbkdf2_sha256 / plain-text hashes to argon2id
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+
+    return user
+
+
 # ✅ JSON login (frontend uses this)
 @router.post("/login", response_model=LoginOut)
-def login(payload: LoginIn, db: Session = Depends(get_db)):
+async def login(payload: LoginIn, db: AsyncSession = Depends(get_db)):
     username = payload.username.strip()
 
-    user = db.query(User).filter(User.username == username).first()
-    if not user or not verify_password(payload.password, user.password_hash):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid username or password")
+    user = await authenticate_user(db, username, payload.password)
 
-    token = create_access_token({"sub": str(user.id), "role": user.role})
+    token = create_access_token(
+        {"sub": str(user.id), "username": user.username, "name": user.name, "role": user.role}
+    )
 
     return LoginOut(
         access_token=token,
@@ -52,15 +80,15 @@ def login(payload: LoginIn, db: Session = Depends(get_db)):
 
 # ✅ Swagger "Authorize" uses this (OAuth2 form)
 @router.post("/token", response_model=LoginOut)
-def token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     username = (form_data.username or "").strip()
     password = form_data.password or ""
 
-    user = db.query(User).filter(User.username == username).first()
-    if not user or not verify_password(password, user.password_hash):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid username or password")
+    user = await authenticate_user(db, username, password)
 
-    token = create_access_token({"sub": str(user.id), "role": user.role})
+    token = create_access_token(
+        {"sub": str(user.id), "username": user.username, "name": user.name, "role": user.role}
+    )
 
     return LoginOut(
         access_token=token,
@@ -69,5 +97,15 @@ def token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
 
 
 @router.get("/me", response_model=UserOut)
-def me(current_user: User = Depends(get_current_user)):
+async def me(current_user: CurrentUser = Depends(get_current_user_db)):
     return UserOut.model_validate(current_user)
+
+
+# ✅ server-side logout: token is rejected from now on (until it expires)
+@router.post("/logout")
+async def logout(
+    token: str = Depends(oauth2_scheme),
+    _user: CurrentUser = Depends(get_current_user),
+):
+    await revoke_token(token)
+    return {"ok": True}
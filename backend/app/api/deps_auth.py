@@ -1,11 +1,18 @@
 # backend/app/api/deps_auth.py
 
+import hashlib
+import json
+import time
+from typing import Optional
+
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import SessionLocal
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
 from app.core.security import decode_token
 from app.models.user import User as UserModel
 
@@ -22,28 +29,202 @@ class CurrentUser(BaseModel):
     role: str  # "manager" | "viewer"
 
 
-def get_db():
-    db = SessionLocal()
+# verified token -> (CurrentUser, exp)
+# skips JWT decode + user lookup for repeat requests with the same token
+_TOKEN_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+# revoked token -> exp (kept until the token would have expired anyway)
+_REVOKED_TOKENS: dict[bytes, int] = {}
+
+
+# optional shared cache across uvicorn workers / Render replicas: REDIS_URL=redis://...
+# short timeouts: if Redis is down we fall back to the local cache instead of hanging auth
+# redis is only imported when REDIS_URL is set (optional dependency)
+REDIS_URL = settings.redis_url.strip()
+if REDIS_URL:
+    from redis import asyncio as aioredis
+    from redis.exceptions import RedisError
+
+    _redis = aioredis.from_url(REDIS_URL, socket_connect_timeout=0.5, socket_timeout=0.5)
+else:
+    class RedisError(Exception):
+        """Placeholder: never raised, every Redis call is skipped when _redis is None."""
+
+    _redis = None
+
+# circuit breaker: after a RedisError skip Redis for a few seconds,
+# so a slow/unreachable Redis doesn't add socket_timeout to every request
+_REDIS_BACKOFF = 5.0
+_redis_down_until = 0.0
+
+
+def _shared_client():
+    if _redis is None or time.monotonic() < _redis_down_until:
+        return None
+    return _redis
+
+
+def _shared_failed() -> None:
+    global _redis_down_until
+    _redis_down_until = time.monotonic() + _REDIS_BACKOFF
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+async def _shared_lookup(key: bytes) -> tuple[bool, Optional[tuple[CurrentUser, int]]]:
+    """
+    (revoked, (CurrentUser, exp) or None) from Redis; (False, None) if not configured/unavailable.
+    """
+    client = _shared_client()
+    if client is None:
+        return False, None
+
+    k = key.hex()
+    try:
+        revoked, raw = await client.mget(f"jwt:revoked:{k}", f"jwt:{k}")
+    except RedisError:
+        _shared_failed()
+        return False, None
+
+    if revoked:
+        return True, None
+    if not raw:
+        return False, None
+
+    # malformed entry -> treat as a miss (decode the token instead of a 500)
     try:
+        data = json.loads(raw)
+        return False, (CurrentUser(**data["user"]), int(data["exp"]))
+    except (ValueError, KeyError, TypeError):
+        return False, None
+
+
+async def _shared_revoked(key: bytes) -> bool:
+    """
+    True if another worker/replica revoked this token; False if not configured/unavailable.
+    """
+    client = _shared_client()
+    if client is None:
+        return False
+
+    try:
+        return bool(await client.exists(f"jwt:revoked:{key.hex()}"))
+    except RedisError:
+        _shared_failed()
+        return False
+
+
+async def _shared_store(key: bytes, user: CurrentUser, exp: int) -> None:
+    ttl = int(exp - time.time())
+    client = _shared_client()
+    if client is None or ttl <= 0:
+        return
+
+    try:
+        await client.setex(f"jwt:{key.hex()}", ttl, json.dumps({"user": user.model_dump(), "exp": exp}))
+    except RedisError:
+        _shared_failed()
+
+
+async def _shared_revoke(key: bytes, exp: int) -> None:
+    ttl = int(exp - time.time())
+    client = _shared_client()
+    if client is None or ttl <= 0:
+        return
+
+    k = key.hex()
+    try:
+        async with client.pipeline(transaction=True) as pipe:
+            await pipe.setex(f"jwt:revoked:{k}", ttl, 1).delete(f"jwt:{k}").execute()
+    except RedisError:
+        _shared_failed()
+
+
+def _mark_revoked(key: bytes, exp: int) -> None:
+    # sweep entries whose token has expired anyway, so the set stays bounded
+    now = time.time()
+    for k in [k for k, e in _REVOKED_TOKENS.items() if e <= now]:
+        del _REVOKED_TOKENS[k]
+
+    _REVOKED_TOKENS[key] = exp
+
+
+async def revoke_token(token: str) -> None:
+    key = _token_key(token)
+
+    cached = _TOKEN_CACHE.pop(key, None)
+    if cached is not None:
+        exp = cached[1]
+    else:
+        try:
+            exp = int(decode_token(token).get("exp") or 0)
+        except Exception:
+            return  # invalid/expired token, nothing to revoke
+
+    _mark_revoked(key, exp)
+    await _shared_revoke(key, exp)
+
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> CurrentUser:
-    cred_exc = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Not authenticated",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+async def _load_user(db: AsyncSession, user_id: int) -> CurrentUser:
+    user = await db.get(UserModel, user_id)
+    if not user:
+        raise _credentials_exception()
+
+    return CurrentUser(
+        id=user.id,
+        username=user.username,
+        name=user.name,
+        role=user.role,
+    )
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> CurrentUser:
+    cred_exc = _credentials_exception()
+
     # token must be the raw JWT (OAuth2PasswordBearer strips "Bearer ")
     if not token or not isinstance(token, str):
         raise cred_exc
 
+    key = _token_key(token)
+    if key in _REVOKED_TOKENS:
+        raise cred_exc
+
+    cached = _TOKEN_CACHE.get(key)
+    if cached is not None and cached[1] > time.time():
+        # a logout on another worker only reaches us through Redis: one EXISTS round trip
+        # per hit (a network call, not cheaper than a local decode) so revocation applies
+        # immediately; skipped while the circuit breaker has Redis marked down
+        if await _shared_revoked(key):
+            _TOKEN_CACHE.pop(key, None)
+            _mark_revoked(key, cached[1])
+            raise cred_exc
+        return cached[0]
+
+    revoked, shared = await _shared_lookup(key)
+    if revoked:
+        raise cred_exc
+    if shared is not None and shared[1] > time.time():
+        _TOKEN_CACHE[key] = shared
+        return shared[0]
+
     try:
         payload = decode_token(token)
     except Exception:
@@ -59,19 +240,38 @@ def get_current_user(
     except Exception:
         raise cred_exc
 
-    user = db.get(UserModel, user_id)
-    if not user:
-        raise cred_exc
+    # ✅ user claims are signed into the token at login -> no DB lookup needed
+    username = payload.get("username")
+    name = payload.get("name")
+    role = payload.get("role")
+    if username and name and role:
+        current = CurrentUser(id=user_id, username=username, name=name, role=role)
+    else:
+        # tokens issued before claims were embedded
+        current = await _load_user(db, user_id)
 
-    return CurrentUser(
-        id=user.id,
-        username=user.username,
-        name=user.name,
-        role=user.role,
-    )
+    exp = payload.get("exp")
+    if exp:
+        _TOKEN_CACHE[key] = (current, int(exp))
+        await _shared_store(key, current, int(exp))
+
+    return current
+
+
+async def get_current_user_db(
+    user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> CurrentUser:
+    """
+    Same as get_current_user, but re-reads the user row instead of trusting the
+    token claims (for endpoints that need current name/role, e.g. account info).
+    """
+    return await _load_user(db, user.id)
 
 
-def require_manager(user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
+# writes check the role stored in the DB, not the token claim:
+# a demoted/deleted manager loses write access immediately, not when the token expires
+async def require_manager(user: CurrentUser = Depends(get_current_user_db)) -> CurrentUser:
     if user.role != "manager":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Manager role required")
     return user
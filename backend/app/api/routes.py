@@ -1,42 +1,36 @@
 # backend/app/api/routes.py
 
 from fastapi import APIRouter, HTTPException, Depends, Request
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import List, Optional, Literal
-from sqlalchemy.orm import Session
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 import csv
 import io
 
-from app.core.database import SessionLocal
 from app.models.product import Product as ProductModel
 from app.models.audit_log import AuditLog as AuditLogModel
-from app.services.reorder import compute_reorder_fields
+from app.services.reorder import reorder_query
+from app.services.audit_buffer import AUDIT_INSERT, audit_buffer, defer_audit_row
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
 
 # ✅ IMPORTANT FIX:
 # Use the SAME auth dependency used by auth_routes (single source of truth for JWT secret/logic).
-from app.api.deps_auth import get_current_user, require_manager, CurrentUser
+from app.api.deps_auth import get_db, get_current_user, require_manager, CurrentUser
 
 router = APIRouter()
 
-# ---------- DB DEP ----------
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # ---------- AUDIT HELPERS ----------
 
 def get_ip(request: Request) -> Optional[str]:
     return request.client.host if request.client else None
 
 
-def add_audit_log(
-    db: Session,
+async def add_audit_log(
+    db: AsyncSession,
     *,
     action: str,
     p: ProductModel,
@@ -45,7 +39,7 @@ def add_audit_log(
     actor: str,
     ip: Optional[str],
 ):
-    log = AuditLogModel(
+    row = dict(
         action=action,
         product_id=p.id,
         sku=p.sku,
@@ -56,10 +50,20 @@ def add_audit_log(
         actor=actor,
         ip=ip,
     )
-    db.add(log)
+
+    # AUDIT_BUFFER=1: handed to the batch writer after the request commits
+    if settings.audit_buffer_enabled and audit_buffer.running:
+        defer_audit_row(db, row)
+        return
+
+    # Core INSERT: the log is never read back in the request, so skip ORM unit-of-work
+    await db.execute(AUDIT_INSERT, row)
 
 # ---------- SCHEMAS ----------
 
+# products.lead_time_days is a SMALLINT
+MAX_LEAD_TIME_DAYS = 32767
+
 class Product(BaseModel):
     id: int
     sku: str
@@ -93,7 +97,7 @@ class ProductCreate(BaseModel):
     low_stock_threshold: int = 10
 
     supplier: Optional[str] = None
-    lead_time_days: int = 0
+    lead_time_days: int = Field(0, le=MAX_LEAD_TIME_DAYS)
     avg_daily_demand: float = 0.0
     safety_stock: int = 0
 
@@ -104,7 +108,7 @@ class ProductUpdate(BaseModel):
     low_stock_threshold: Optional[int] = None
 
     supplier: Optional[str] = None
-    lead_time_days: Optional[int] = None
+    lead_time_days: Optional[int] = Field(None, le=MAX_LEAD_TIME_DAYS)
     avg_daily_demand: Optional[float] = None
     safety_stock: Optional[int] = None
 
@@ -155,39 +159,50 @@ class AuditLogOut(BaseModel):
     class Config:
         from_attributes = True
 
-# ---------- ROUTES ----------
+# columns the Product schema needs, selected as plain rows (no ORM objects / identity map)
+PRODUCT_COLUMNS = [getattr(ProductModel, f) for f in Product.model_fields]
+
+# list responses: built once, validated + dumped to JSON bytes by pydantic-core in one pass
+# (response_model stays on the routes for the OpenAPI schema)
+PRODUCT_LIST = TypeAdapter(List[Product])
+AUDIT_LOG_LIST = TypeAdapter(List[AuditLogOut])
+
 
-@router.get("/ping")
-def ping():
-    return {"message": "pong"}
+def json_list(adapter: TypeAdapter, rows) -> Response:
+    items = adapter.validate_python(rows, from_attributes=True)
+    return Response(adapter.dump_json(items), media_type="application/json")
+
+# ---------- ROUTES ----------
 
 # ---------- PRODUCTS (viewer+manager can read) ----------
 
 @router.get("/products", response_model=List[Product])
-def list_products(
-    db: Session = Depends(get_db),
+async def list_products(
+    db: AsyncSession = Depends(get_db),
     _user: CurrentUser = Depends(get_current_user),
 ):
-    return (
-        db.query(ProductModel)
-        .filter(ProductModel.is_active == True)
-        .all()
+    result = await db.execute(
+        select(*PRODUCT_COLUMNS)
+        .where(ProductModel.is_active == True)
     )
+    return json_list(PRODUCT_LIST, result.mappings().all())
 
 # ---------- PRODUCTS (manager only can write) ----------
 
 @router.post("/products", response_model=Product)
-def create_product(
+async def create_product(
     payload: ProductCreate,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user: CurrentUser = Depends(require_manager),
 ):
-    if (
-        db.query(ProductModel)
-        .filter(ProductModel.sku == payload.sku, ProductModel.is_active == True)
-        .first()
-    ):
+    # EXISTS -> single boolean, answered from ix_products_active_sku (no row load)
+    sku_taken = await db.scalar(
+        select(
+            exists().where(ProductModel.sku == payload.sku, ProductModel.is_active == True)
+        )
+    )
+    if sku_taken:
         raise HTTPException(status_code=400, detail="SKU already exists")
 
     p = ProductModel(
@@ -204,11 +219,10 @@ def create_product(
     )
 
     db.add(p)
-    db.commit()
-    db.refresh(p)
+    await db.flush()  # assigns p.id for the audit row, same transaction
 
     # audit: product_create (stock snapshot)
-    add_audit_log(
+    await add_audit_log(
         db,
         action="product_create",
         p=p,
@@ -217,20 +231,22 @@ def create_product(
         actor=user.name or user.username,
         ip=get_ip(request),
     )
-    db.commit()
 
+    # one commit: product + audit row land together (or not at all)
+    await db.commit()
+    await db.refresh(p)
     return p
 
 
 @router.patch("/products/{product_id}", response_model=Product)
-def update_product(
+async def update_product(
     product_id: int,
     payload: ProductUpdate,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user: CurrentUser = Depends(require_manager),
 ):
-    p = db.get(ProductModel, product_id)
+    p = await db.get(ProductModel, product_id)
     if not p or not p.is_active:
         raise HTTPException(status_code=404, detail="Product not found")
 
@@ -240,7 +256,7 @@ def update_product(
         setattr(p, k, v)
 
     # audit metadata update (qty snapshot)
-    add_audit_log(
+    await add_audit_log(
         db,
         action="product_update",
         p=p,
@@ -250,20 +266,20 @@ def update_product(
         ip=get_ip(request),
     )
 
-    db.commit()
-    db.refresh(p)
+    await db.commit()
+    await db.refresh(p)
     return p
 
 
 @router.patch("/products/{product_id}/stock", response_model=Product)
-def update_stock(
+async def update_stock(
     product_id: int,
     payload: StockUpdate,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user: CurrentUser = Depends(require_manager),
 ):
-    p = db.get(ProductModel, product_id)
+    p = await db.get(ProductModel, product_id)
     if not p or not p.is_active:
         raise HTTPException(status_code=404, detail="Product not found")
 
@@ -272,7 +288,7 @@ def update_stock(
 
     p.quantity = new_qty
 
-    add_audit_log(
+    await add_audit_log(
         db,
         action="stock_update",
         p=p,
@@ -282,25 +298,25 @@ def update_stock(
         ip=get_ip(request),
     )
 
-    db.commit()
-    db.refresh(p)
+    await db.commit()
+    await db.refresh(p)
     return p
 
 
 @router.delete("/products/{product_id}")
-def delete_product(
+async def delete_product(
     product_id: int,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user: CurrentUser = Depends(require_manager),
 ):
-    p = db.get(ProductModel, product_id)
+    p = await db.get(ProductModel, product_id)
     if not p or not p.is_active:
         raise HTTPException(status_code=404, detail="Product not found")
 
     # audit before soft delete
     qty = int(p.quantity or 0)
-    add_audit_log(
+    await add_audit_log(
         db,
         action="product_delete",
         p=p,
@@ -311,93 +327,82 @@ def delete_product(
     )
 
     p.is_active = False
-    db.commit()
+    await db.commit()
     return {"ok": True}
 
 # ---------- REORDER (viewer+manager can read) ----------
 
 @router.get("/reorder", response_model=List[ReorderItem])
-def reorder_list(
-    db: Session = Depends(get_db),
+async def reorder_list(
+    db: AsyncSession = Depends(get_db),
     _user: CurrentUser = Depends(get_current_user),
 ):
-    items: List[ReorderItem] = []
-
-    products = (
-        db.query(ProductModel)
-        .filter(ProductModel.is_active == True)
-        .all()
-    )
-
-    for p in products:
-        fields = compute_reorder_fields(p)
-        if fields["status"] != "OK":
-            items.append(
-                ReorderItem(
-                    id=p.id,
-                    sku=p.sku,
-                    name=p.name,
-                    category=p.category,
-                    supplier=p.supplier,
-                    quantity=p.quantity,
-                    lead_time_days=p.lead_time_days,
-                    avg_daily_demand=p.avg_daily_demand,
-                    safety_stock=p.safety_stock,
-                    **fields,
-                )
-            )
-
-    return items
+    # reorder point / status are computed in SQL; only non-OK rows come back
+    result = await db.execute(reorder_query())
+    return [ReorderItem(**row) for row in result.mappings()]
 
 
 @router.get("/reorder.csv")
-def reorder_list_csv(
-    db: Session = Depends(get_db),
+async def reorder_list_csv(
     _user: CurrentUser = Depends(get_current_user),
 ):
-    items = reorder_list(db=db)
-
-    buf = io.StringIO()
-    w = csv.writer(buf)
-    w.writerow(
-        [
-            "sku",
-            "name",
-            "category",
-            "supplier",
-            "quantity",
-            "lead_time_days",
-            "avg_daily_demand",
-            "safety_stock",
-            "reorder_point",
-            "status",
-            "target_stock",
-            "suggested_reorder",
-            "below_by",
-        ]
-    )
+    # stream in batches: memory stays flat and the first bytes go out immediately
+    # own session: the body is sent after the handler returns, so don't rely on
+    # the request-scoped get_db session still being open then
+    async def iter_csv():
+        buf = io.StringIO()
+        w = csv.writer(buf)
 
-    for r in items:
         w.writerow(
             [
-                r.sku,
-                r.name,
-                r.category or "",
-                r.supplier or "",
-                r.quantity,
-                r.lead_time_days,
-                r.avg_daily_demand,
-                r.safety_stock,
-                r.reorder_point,
-                r.status,
-                r.target_stock,
-                r.suggested_reorder,
-                r.below_by,
+                "sku",
+                "name",
+                "category",
+                "supplier",
+                "quantity",
+                "lead_time_days",
+                "avg_daily_demand",
+                "safety_stock",
+                "reorder_point",
+                "status",
+                "target_stock",
+                "suggested_reorder",
+                "below_by",
             ]
         )
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(reorder_query().execution_options(yield_per=500))
+
+            async for batch in result.mappings().partitions():
+                for r in batch:
+                    w.writerow(
+                        [
+                            r["sku"],
+                            r["name"],
+                            r["category"] or "",
+                            r["supplier"] or "",
+                            r["quantity"],
+                            r["lead_time_days"],
+                            float(r["avg_daily_demand"]),
+                            r["safety_stock"],
+                            r["reorder_point"],
+                            r["status"],
+                            r["target_stock"],
+                            r["suggested_reorder"],
+                            r["below_by"],
+                        ]
+                    )
+
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
 
     return StreamingResponse(
-        io.BytesIO(buf.getvalue().encode("utf-8")),
+        iter_csv(),
         media_type="text/csv",
         headers={"Content-Disposition": 'attachment; filename="reorder_list.csv"'},
     )
@@ -405,17 +410,18 @@ def reorder_list_csv(
 # ---------- AUDIT LOG READ (viewer+manager can read) ----------
 
 @router.get("/audit-logs", response_model=List[AuditLogOut])
-def list_audit_logs(
+async def list_audit_logs(
     product_id: Optional[int] = None,
     limit: int = 50,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _user: CurrentUser = Depends(get_current_user),
 ):
     limit = max(1, min(limit, 200))
 
-    q = db.query(AuditLogModel).order_by(AuditLogModel.id.desc())
+    q = select(AuditLogModel).order_by(AuditLogModel.id.desc())
 
     if product_id is not None:
-        q = q.filter(AuditLogModel.product_id == product_id)
+        q = q.where(AuditLogModel.product_id == product_id)
 
-    return q.limit(limit).all()
+    result = await db.execute(q.limit(limit))
+    return json_list(AUDIT_LOG_LIST, result.scalars().all())
@@ -1,14 +1,62 @@
 # backend/app/core/config.py
 
+from functools import lru_cache
+from typing import List
+
+from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     app_env: str = "dev"
 
+    # database
+    database_url: str = Field("sqlite:///./inventory.db", validation_alias="DATABASE_URL")
+    db_pool_size: int = Field(20, validation_alias=AliasChoices("DB_POOL_SIZE", "SQLALCHEMY_POOL_SIZE"))
+    db_max_overflow: int = Field(20, validation_alias="DB_MAX_OVERFLOW")
+    db_pool_recycle: int = Field(1800, validation_alias="DB_POOL_RECYCLE")
+
+    # auth / JWT
+    # ✅ ONE secret everywhere. Put this on Render as JWT_SECRET_KEY
+    jwt_secret_key: str = Field(
+        "dev-secret-change-me",
+        validation_alias=AliasChoices("JWT_SECRET_KEY", "JWT_SECRET", "SECRET_KEY"),
+    )
+    jwt_algorithm: str = Field("HS256", validation_alias="JWT_ALGORITHM")
+    access_token_expire_minutes: int = Field(10080, validation_alias="ACCESS_TOKEN_EXPIRE_MINUTES")
+
+    # seed scripts: cheap argon2 params for dev/CI seed users
+    # (real logins re-hash them to the full pwd_context params via needs_update)
+    seed_hash_time_cost: int = Field(1, validation_alias="SEED_HASH_TIME_COST")
+    seed_hash_memory_cost: int = Field(1024, validation_alias="SEED_HASH_MEMORY_COST")  # KiB
+
+    # audit log: batch inserts in the background (off = written in the request's transaction)
+    audit_buffer_enabled: bool = Field(False, validation_alias="AUDIT_BUFFER")
+
+    # optional shared token cache (multi-worker / multi-replica)
+    redis_url: str = Field("", validation_alias="REDIS_URL")
+
+    # CORS: comma-separated allowlist in prod (Render), fallback to FRONTEND_URL/local
+    # Example: CORS_ORIGINS="https://suppliesense-frontend.onrender.com,http://localhost:3000"
+    cors_origins: str = Field("", validation_alias="CORS_ORIGINS")
+    frontend_url: str = Field("http://localhost:3000", validation_alias="FRONTEND_URL")
+
     class Config:
         env_file = ".env"
         case_sensitive = True
+        env_ignore_empty = True  # FOO= behaves like unset (matches the old `os.getenv(...) or default`)
+        extra = "ignore"
+
+    @property
+    def allow_origins(self) -> List[str]:
+        if self.cors_origins.strip():
+            return [o.strip() for o in self.cors_origins.split(",") if o.strip()]
+        return list({self.frontend_url.strip(), "http://localhost:3000"})
+
+
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
 
 
-settings = Settings()
+settings = get_settings()
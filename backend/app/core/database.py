@@ -1,15 +1,112 @@
-import os
-
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import URL, Connection, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./inventory.db")
+DATABASE_URL = settings.database_url
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
 
 # SQLite needs check_same_thread, Postgres must NOT have it
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+connect_args = {"check_same_thread": False} if IS_SQLITE else {}
+
+# Explicit pool sizing for the Postgres API engine (defaults are 5 + 10 overflow, no recycle).
+# pool_recycle/pre_ping avoid stale connections after Render/Neon idle timeouts.
+pool_kwargs = (
+    {}
+    if IS_SQLITE
+    else {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_timeout": 30,
+    }
+)
+
+# compiled SQL cache per engine (default 500 entries)
+QUERY_CACHE_SIZE = 1200
+
+# psycopg2 only: also batch executemany UPDATE/DELETE via execute_batch()
+# (INSERTs already go through SQLAlchemy's insertmanyvalues, 1000 rows/page)
+driver_kwargs = (
+    {"executemany_mode": "values_plus_batch", "executemany_batch_page_size": 500}
+    if make_url(DATABASE_URL).get_driver_name() == "psycopg2"
+    else {}
+)
 
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
+# sync engine: one-shot seed scripts only (alembic builds its own), so no pool to keep warm
+engine = create_engine(
+    DATABASE_URL,
+    connect_args=connect_args,
+    poolclass=NullPool,
+    query_cache_size=QUERY_CACHE_SIZE,
+    **driver_kwargs,
+)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _async_url(url: str) -> URL:
+    """
+    Map DATABASE_URL onto the async drivers (aiosqlite / asyncpg).
+    """
+    u = make_url(url)
+    backend = u.get_backend_name()
+
+    if backend == "sqlite":
+        return u.set(drivername="sqlite+aiosqlite")
+
+    if backend in ("postgres", "postgresql"):
+        # asyncpg takes ssl=..., not libpq's sslmode / channel_binding (Neon URLs)
+        query = dict(u.query)
+        sslmode = query.pop("sslmode", None)
+        query.pop("channel_binding", None)
+        if sslmode:
+            query["ssl"] = sslmode
+        return u.set(drivername="postgresql+asyncpg", query=query)
+
+    return u
+
+
+# async engine: API request handlers
+async_engine = create_async_engine(
+    _async_url(DATABASE_URL),
+    query_cache_size=QUERY_CACHE_SIZE,
+    **pool_kwargs,
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, _connection_record):
+    # WAL: readers don't block the writer; NORMAL sync is safe with WAL
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+
+if IS_SQLITE:
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+
+def dialect_insert(bind: Engine | Connection):
+    """
+    insert() with ON CONFLICT support (on_conflict_do_update) for the bound dialect.
+    """
+    return postgresql.insert if bind.dialect.name == "postgresql" else sqlite.insert
+
+
 Base = declarative_base()
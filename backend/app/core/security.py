@@ -1,28 +1,38 @@
 # backend/app/core/security.py
 
-import os
-from datetime import datetime, timedelta
+import time
 from typing import Any, Optional
 
-from jose import jwt, JWTError
+import jwt
+from jwt import InvalidTokenError
 from passlib.context import CryptContext
 
-# ✅ ONLY pbkdf2_sha256 (no bcrypt anywhere)
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
-
-# ✅ IMPORTANT: use ONE secret everywhere (routes.py + deps_auth.py + auth_routes.py)
-# Put this on Render as JWT_SECRET_KEY
-SECRET_KEY = (
-    os.getenv("JWT_SECRET_KEY")
-    or os.getenv("JWT_SECRET")
-    or os.getenv("SECRET_KEY")
-    or "dev-secret-change-me"
+from app.core.config import settings
+
+# ✅ argon2id for new hashes (OWASP params), no bcrypt anywhere.
+# pbkdf2_sha256 stays only to verify existing rows; they get re-hashed on next login.
+pwd_context = CryptContext(
+    schemes=["argon2", "pbkdf2_sha256"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
 )
 
-# ✅ keep algorithm consistent too
-ALGORITHM = os.getenv("JWT_ALGORITHM") or "HS256"
+# prefixes of hashes pwd_context can verify
+_HASH_PREFIXES = ("$argon2", "$pbkdf2-sha256$")
 
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "10080"))
+# ✅ IMPORTANT: use ONE secret everywhere (routes.py + deps_auth.py + auth_routes.py)
+# all read once from Settings (JWT_SECRET_KEY / JWT_ALGORITHM / ACCESS_TOKEN_EXPIRE_MINUTES)
+SECRET_KEY = settings.jwt_secret_key
+ALGORITHM = settings.jwt_algorithm
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
+_DEFAULT_TTL = ACCESS_TOKEN_EXPIRE_MINUTES * 60  # seconds
+
+# one pre-configured verifier per process (options/algorithms set up once, not per request)
+_ALGORITHMS = [ALGORITHM]
+_verifier = jwt.PyJWT(options={"require": ["exp", "sub"]})
 
 
 def hash_password(password: str) -> str:
@@ -30,8 +40,24 @@ def hash_password(password: str) -> str:
 
 
 def verify_password(plain_password: str, hashed_password) -> bool:
+    return verify_and_update_password(plain_password, hashed_password)[0]
+
+
+def verify_and_update_password(plain_password: str, hashed_password) -> tuple[bool, Optional[str]]:
+    """
+    Returns (ok, new_hash). new_hash is set when the password matched but the
+    stored hash is outdated (pbkdf2_sha256 / plain text) and should be replaced.
+    """
+    # fast path: password_hash is a str column holding a passlib hash
+    if isinstance(hashed_password, str) and hashed_password.startswith(_HASH_PREFIXES):
+        return pwd_context.verify_and_update(plain_password or "", hashed_password)
+
+    return _verify_and_update_legacy(plain_password, hashed_password)
+
+
+def _verify_and_update_legacy(plain_password: str, hashed_password) -> tuple[bool, Optional[str]]:
     if hashed_password is None:
-        return False
+        return False, None
 
     # handle bytes/memoryview from DB
     if isinstance(hashed_password, memoryview):
@@ -47,21 +73,20 @@ def verify_password(plain_password: str, hashed_password) -> bool:
 
     # ✅ if it's NOT a passlib hash, don't crash (prevents 500)
     # portfolio-safe fallback: treat as plain text compare
-    if not s.startswith("$pbkdf2-sha256$"):
-        return (plain_password or "") == s
+    if not s.startswith(_HASH_PREFIXES):
+        ok = (plain_password or "") == s
+        return ok, (hash_password(plain_password) if ok else None)
 
-    return pwd_context.verify(plain_password or "", s)
+    return pwd_context.verify_and_update(plain_password or "", s)
 
 
-def create_access_token(data: dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
-    to_encode = data.copy()
-    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+def create_access_token(data: dict[str, Any], ttl: int = _DEFAULT_TTL) -> str:
+    # exp is plain Unix seconds (what JWT defines), no datetime objects needed
+    return jwt.encode({**data, "exp": int(time.time()) + ttl}, SECRET_KEY, algorithm=ALGORITHM)
 
 
 def decode_token(token: str) -> dict[str, Any]:
     try:
-        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-    except JWTError as e:
+        return _verifier.decode(token, SECRET_KEY, algorithms=_ALGORITHMS)
+    except InvalidTokenError as e:
         raise ValueError("Invalid token") from e
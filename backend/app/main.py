@@ -1,22 +1,30 @@
 # backend/app/main.py
 
-import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.api.routes import router as api_router
 from app.api.auth_routes import router as auth_router
+from app.core.config import settings
+from app.services.audit_buffer import audit_buffer
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    if settings.audit_buffer_enabled:
+        await audit_buffer.start()
+    yield
+    # flush whatever is still buffered before the worker exits
+    await audit_buffer.stop()
+
 
-app = FastAPI(title="SupplySense API", version="0.1.0")
+app = FastAPI(title="SupplySense API", version="0.1.0", lifespan=lifespan)
 
-# Prefer a comma-separated allowlist in prod (Render), fallback to FRONTEND_URL/local
-# Example: CORS_ORIGINS="https://suppliesense-frontend.onrender.com,http://localhost:3000"
-cors_env = os.getenv("CORS_ORIGINS", "").strip()
-if cors_env:
-    ALLOW_ORIGINS = [o.strip() for o in cors_env.split(",") if o.strip()]
-else:
-    FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000").strip()
-    ALLOW_ORIGINS = list({FRONTEND_URL, "http://localhost:3000"})
+# CORS_ORIGINS allowlist (or FRONTEND_URL/local fallback), see Settings.allow_origins
+ALLOW_ORIGINS = settings.allow_origins
 
 app.add_middleware(
     CORSMiddleware,
@@ -30,6 +38,20 @@ app.include_router(auth_router, prefix="/api/auth", tags=["auth"])
 app.include_router(api_router, prefix="/api")
 
 
+# health checks live on the app itself (no router prefix, no dependencies, no DB)
+# async def -> answered on the event loop, no threadpool hop
 @app.get("/health")
-def health():
+async def health():
     return {"status": "ok"}
+
+
+# load balancer ping (plain text, no JSON encoding)
+@app.get("/ping", response_class=PlainTextResponse)
+async def ping():
+    return PlainTextResponse("pong")
+
+
+# existing health-check configs point here and may parse the body: keep the JSON shape
+@app.get("/api/ping")
+async def api_ping():
+    return {"message": "pong"}
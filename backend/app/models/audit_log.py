@@ -1,18 +1,25 @@
-from sqlalchemy import Column, DateTime, Integer, String, func
+from sqlalchemy import Column, DateTime, Index, Integer, String, func, text
 from app.core.database import Base
 
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
 
-    id = Column(Integer, primary_key=True, index=True)
+    __table_args__ = (
+        # audit log read: [WHERE product_id = ?] ORDER BY id DESC
+        Index("ix_audit_product_id_desc", "product_id", text("id DESC")),
+        # time-range scans on an append-only table: BRIN on Postgres (a few pages), B-tree elsewhere
+        Index("ix_audit_logs_created_at_brin", "created_at", postgresql_using="brin"),
+    )
+
+    id = Column(Integer, primary_key=True)
 
     # what happened
     action = Column(String, nullable=False)  # e.g. "stock_update", "product_create"
 
     # what item
-    product_id = Column(Integer, nullable=False, index=True)
-    sku = Column(String, nullable=False, index=True)
+    product_id = Column(Integer, nullable=False)  # indexed via ix_audit_product_id_desc
+    sku = Column(String, nullable=False)
     name = Column(String, nullable=False)
 
     # change details
@@ -1,13 +1,17 @@
 from sqlalchemy import (
     Column,
     Integer,
+    SmallInteger,
+    Float,
     String,
     DateTime,
     Boolean,
     CheckConstraint,
     Index,
+    func,
+    text,
+    true,
 )
-from datetime import datetime
 from app.core.database import Base
 
 
@@ -22,11 +26,19 @@ class Product(Base):
         CheckConstraint("safety_stock >= 0", name="ck_safety_stock_non_negative"),
 
         # PERFORMANCE INDEXES
-        Index("ix_products_sku", "sku"),
+        # (sku lookups use the uq_products_sku unique index)
         Index("ix_products_supplier", "supplier"),
+        Index("ix_products_active_sku", "is_active", "sku"),
+        Index("ix_products_active_supplier", "is_active", "supplier"),
+        Index(
+            "ix_products_active",
+            "is_active",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active"),
+        ),
     )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
 
     sku = Column(String, unique=True, nullable=False)
     name = Column(String, nullable=False)
@@ -38,17 +50,18 @@ class Product(Base):
     # legacy (still supported)
     low_stock_threshold = Column(Integer, default=10)
 
-    lead_time_days = Column(Integer, default=0)
-    avg_daily_demand = Column(Integer, default=0)
+    lead_time_days = Column(SmallInteger, default=0)  # days: INT2 is plenty (API caps at 32767)
+    avg_daily_demand = Column(Float, default=0.0)
     safety_stock = Column(Integer, default=0)
 
     # soft delete
-    is_active = Column(Boolean, default=True)
+    is_active = Column(Boolean, server_default=true(), nullable=False)
 
-    # timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # timestamps (stamped by the DB, not sent as INSERT params)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(
         DateTime,
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow,
+        server_default=func.now(),
+        onupdate=func.now(),  # rendered into the UPDATE as now(); no trigger needed
+        nullable=False,
     )
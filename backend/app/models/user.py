@@ -5,7 +5,7 @@ from app.core.database import Base
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
 
     username = Column(String, unique=True, index=True, nullable=False)
     name = Column(String, nullable=False)
@@ -1,4 +1,6 @@
-from app.core.database import SessionLocal, engine, Base
+from sqlalchemy import func
+
+from app.core.database import SessionLocal, engine, Base, dialect_insert
 from app.models.product import Product
 
 # make sure tables exist
@@ -6,12 +8,9 @@ Base.metadata.create_all(bind=engine)
 
 db = SessionLocal()
 
-# wipe existing data (DEV ONLY)
-db.query(Product).delete()
-db.commit()
-
+# plain dicts + one Core upsert keyed on sku (re-running the seed resets these rows, no wipe)
 products = [
-    Product(
+    dict(
         sku="SKU-001",
         name="Widget A",
         category="Widgets",
@@ -22,7 +21,7 @@ products = [
         avg_daily_demand=1.5,
         safety_stock=5,
     ),
-    Product(
+    dict(
         sku="SKU-002",
         name="Widget B",
         category="Widgets",
@@ -33,7 +32,7 @@ products = [
         avg_daily_demand=2.0,
         safety_stock=4,
     ),
-    Product(
+    dict(
         sku="SKU-003",
         name="Gadget C",
         category="Gadgets",
@@ -46,7 +45,17 @@ products = [
     ),
 ]
 
-db.add_all(products)
+insert = dialect_insert(engine)
+# is_active sent explicitly: re-seeding also restores soft-deleted seed products
+stmt = insert(Product).values([{**p, "is_active": True} for p in products])
+stmt = stmt.on_conflict_do_update(
+    index_elements=["sku"],
+    set_={
+        **{k: stmt.excluded[k] for k in [*products[0], "is_active"] if k != "sku"},
+        "updated_at": func.now(),  # onupdate doesn't fire for ON CONFLICT DO UPDATE
+    },
+)
+db.execute(stmt)
 db.commit()
 db.close()
 
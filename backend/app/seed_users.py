@@ -1,42 +1,31 @@
 # backend/app/seed_users.py
 
+from functools import lru_cache
+
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.core.database import SessionLocal
+from app.core.database import SessionLocal, dialect_insert
+from app.core.config import settings
+from app.core.security import pwd_context
 from app.models.user import User as UserModel
 
-
-def _get_hasher():
-    """
-    Reuse project's password hashing function if available.
-    """
-    try:
-        from app.core.security import hash_password  # type: ignore
-        return hash_password
-    except Exception:
-        pass
-
-    try:
-        from app.core.security import get_password_hash  # type: ignore
-        return get_password_hash
-    except Exception:
-        pass
-
-    # fallback (shouldn't happen if your app uses app.core.security)
-    from passlib.context import CryptContext
-    pwd_context = CryptContext(schemes=["bcrypt_sha256", "bcrypt"], deprecated="auto")
-    return pwd_context.hash
+# same schemes as the app, cheaper argon2 cost (SEED_HASH_TIME_COST / SEED_HASH_MEMORY_COST)
+seed_pwd_context = pwd_context.copy(
+    argon2__time_cost=settings.seed_hash_time_cost,
+    argon2__memory_cost=settings.seed_hash_memory_cost,
+)
 
 
-def _set_password(user: UserModel, hashed: str):
+@lru_cache(maxsize=1)
+def _password_field() -> str:
     """
     Different projects name the password column differently.
     We'll try the most common ones.
     """
     for field in ("hashed_password", "password_hash", "password_hashed"):
-        if hasattr(user, field):
-            setattr(user, field, hashed)
-            return
+        if hasattr(UserModel, field):
+            return field
 
     raise RuntimeError(
         "Could not find a password field on User model. "
@@ -45,9 +34,13 @@ def _set_password(user: UserModel, hashed: str):
     )
 
 
-def seed_users():
-    hasher = _get_hasher()
+def _hash_matches(password: str, hashed) -> bool:
+    # any argon2 hash is kept (cheap seed params, or full cost after a login re-hash);
+    # legacy pbkdf2 / plain text values get a fresh argon2 hash
+    return isinstance(hashed, str) and hashed.startswith("$argon2") and pwd_context.verify(password, hashed)
+
 
+def seed_users():
     seeds = [
         {
             "username": "manager",
@@ -63,46 +56,60 @@ def seed_users():
         },
     ]
 
+    password_field = _password_field()
+    columns = ["username", "name", "role", password_field]
+    if hasattr(UserModel, "is_active"):
+        columns.append("is_active")
+
     db: Session = SessionLocal()
     try:
+        usernames = [s["username"] for s in seeds]
+        existing = {
+            r["username"]: r
+            for r in db.execute(
+                select(*(getattr(UserModel, c) for c in columns)).where(UserModel.username.in_(usernames))
+            ).mappings()
+        }
+
+        rows = []
         created = 0
         updated = 0
-
         for s in seeds:
-            hashed = hasher(s["password"])
-
-            existing = db.query(UserModel).filter(UserModel.username == s["username"]).first()
-            if existing:
-                # ✅ FORCE RESET PASSWORD HASH (fixes bcrypt 72-byte issue / algo changes)
-                _set_password(existing, hashed)
-
-                # keep role/name in sync too
-                if hasattr(existing, "name"):
-                    existing.name = s["name"]
-                if hasattr(existing, "role"):
-                    existing.role = s["role"]
-                if hasattr(existing, "is_active"):
-                    existing.is_active = True
-
+            current = existing.get(s["username"])
+            row = {"username": s["username"], "name": s["name"], "role": s["role"]}
+            if "is_active" in columns:
+                row["is_active"] = True
+
+            # ✅ FORCE RESET PASSWORD HASH, but only when the stored one doesn't verify
+            # (verify is one hash op; re-running the seed then writes nothing)
+            if current and _hash_matches(s["password"], current[password_field]):
+                row[password_field] = current[password_field]
+            else:
+                row[password_field] = seed_pwd_context.hash(s["password"])
+
+            if current is None:
+                created += 1
+                print(f"✅ Created: {s['username']} ({s['role']})")
+            elif row != dict(current):
                 updated += 1
-                print(f"♻️ Updated: {s['username']} ({getattr(existing, 'role', 'n/a')})")
+                print(f"♻️ Updated: {s['username']} ({s['role']})")
+            else:
+                print(f"✔️ Unchanged: {s['username']} ({s['role']})")
                 continue
 
-            u = UserModel(
-                username=s["username"],
-                name=s["name"],
-                role=s["role"],
-            )
-            _set_password(u, hashed)
-
-            if hasattr(u, "is_active"):
-                setattr(u, "is_active", True)
+            rows.append(row)
 
-            db.add(u)
-            created += 1
-            print(f"✅ Created: {s['username']} ({s['role']})")
-
-        db.commit()
+        if rows:
+            # one upsert for all changed seeds (no per-user INSERT/UPDATE)
+            insert = dialect_insert(db.get_bind())
+            stmt = insert(UserModel).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["username"],
+                # keep password hash + role/name in sync
+                set_={c: stmt.excluded[c] for c in columns if c != "username"},
+            )
+            db.execute(stmt)
+            db.commit()
 
         print(f"\nDone. Created {created} user(s). Updated {updated} user(s).")
         print("\nLogin creds:")
@@ -0,0 +1,123 @@
+# backend/app/services/audit_buffer.py
+
+import asyncio
+import logging
+from contextlib import suppress
+from typing import Optional
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from app.core.database import AsyncSessionLocal
+from app.models.audit_log import AuditLog
+
+logger = logging.getLogger(__name__)
+
+# built once; executed with a dict (one row) or a list of dicts (executemany)
+AUDIT_INSERT = insert(AuditLog)
+
+# key in Session.info holding audit rows waiting for the request's commit
+_PENDING_KEY = "audit_rows"
+
+
+class AuditBuffer:
+    """
+    Collects audit rows in memory and writes them with one multi-row INSERT
+    every `batch_size` rows or `flush_interval` seconds, whichever comes first.
+    Burst stock updates then cost one transaction per batch instead of one each.
+    """
+
+    def __init__(self, maxsize: int = 4096, batch_size: int = 500, flush_interval: float = 0.1):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue[dict] = asyncio.Queue(maxsize)
+        self._task: Optional[asyncio.Task] = None
+        self._batch: list[dict] = []
+        self._inflight: Optional[asyncio.Future] = None
+        self._overflow: set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="audit-buffer")
+
+    async def stop(self) -> None:
+        """
+        Stop the flusher and write everything still buffered.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+        if self._inflight is not None:
+            with suppress(Exception):
+                await self._inflight
+        if self._overflow:
+            await asyncio.gather(*self._overflow, return_exceptions=True)
+
+        rows, self._batch = self._batch, []
+        while not self._queue.empty():
+            rows.append(self._queue.get_nowait())
+        if rows:
+            await self._write(rows)
+
+    def put(self, row: dict) -> None:
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            # never drop an audit row: write this one on its own
+            task = asyncio.get_running_loop().create_task(self._write([row]))
+            self._overflow.add(task)
+            task.add_done_callback(self._overflow.discard)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                try:
+                    self._batch.append(await asyncio.wait_for(self._queue.get(), deadline - loop.time()))
+                except asyncio.TimeoutError:  # builtin TimeoutError only from 3.11
+                    break
+
+            batch, self._batch = self._batch, []
+            # shielded: a stop() during the INSERT must not leave it half-done
+            self._inflight = asyncio.ensure_future(self._write(batch))
+            await asyncio.shield(self._inflight)
+
+    async def _write(self, rows: list[dict]) -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(AUDIT_INSERT, rows)
+                await db.commit()
+        except Exception:
+            logger.exception("audit buffer: failed to write %d row(s)", len(rows))
+
+
+audit_buffer = AuditBuffer()
+
+
+def defer_audit_row(db, row: dict) -> None:
+    """
+    Queue an audit row for the buffer once `db` commits (dropped on rollback),
+    so a failed request still leaves no audit entry behind.
+    """
+    db.info.setdefault(_PENDING_KEY, []).append(row)
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_after_commit(session: Session) -> None:
+    for row in session.info.pop(_PENDING_KEY, ()):
+        audit_buffer.put(row)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
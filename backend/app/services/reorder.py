@@ -1,42 +1,180 @@
 import math
-from typing import Literal
+from typing import Literal, NamedTuple, Sequence
+
+from sqlalchemy import Integer, Select, case, func, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
 from app.models.product import Product
 
 Status = Literal["OK", "WARNING", "CRITICAL"]
 
 
+class ReorderFields(NamedTuple):
+    reorder_point: int
+    status: Status
+    target_stock: int
+    suggested_reorder: int
+    below_by: int
+
+
 def compute_rop(lead_time_days: int, avg_daily_demand: float, safety_stock: int) -> int:
     if lead_time_days < 0 or avg_daily_demand < 0 or safety_stock < 0:
         return 0
-    return int(math.ceil((avg_daily_demand * lead_time_days) + safety_stock))
+    return _lead_demand(lead_time_days, avg_daily_demand) + safety_stock
+
+
+def _lead_demand(lead_time_days: int, avg_daily_demand: float) -> int:
+    # whole-number demand stays in int math (no float multiply + ceil)
+    if isinstance(avg_daily_demand, int):
+        return avg_daily_demand * lead_time_days
+    return math.ceil(avg_daily_demand * lead_time_days)
+
+
+_STATUS: tuple[Status, ...] = ("CRITICAL", "WARNING", "OK")
 
 
 def compute_status(qty: int, rop: int, safety_stock: int) -> Status:
-    if qty <= safety_stock:
-        return "CRITICAL"
-    if qty <= rop:
-        return "WARNING"
-    return "OK"
+    # branchless: qty <= safety -> 0, qty <= rop -> 1, else 2
+    # (multiply, not add: rop can be below safety_stock when compute_rop() clamps to 0)
+    return _STATUS[(qty > safety_stock) * (1 + (qty > rop))]
 
 
-def compute_reorder_fields(p: Product) -> dict:
+def compute_reorder_fields(
+    p: Product,
+    _ceil=math.ceil,
+    _max=max,
+    _int=int,
+    _status=_STATUS,
+    _fields=ReorderFields,
+) -> ReorderFields:
+    # hot per-row path: _lead_demand() / compute_status() inlined, and the helpers
+    # bound as defaults so they are local lookups instead of globals/builtins
     lead = p.lead_time_days or 0
-    demand = float(p.avg_daily_demand or 0.0)
+    demand = p.avg_daily_demand or 0
     safety = p.safety_stock or 0
     qty = p.quantity or 0
 
-    rop = compute_rop(lead, demand, safety)
-    status = compute_status(qty, rop, safety)
+    # lead_demand computed once, shared by rop and target (same result as compute_rop())
+    lead_demand = demand * lead if demand.__class__ is _int else _ceil(demand * lead)
+    rop = 0 if lead < 0 or demand < 0 or safety < 0 else lead_demand + safety
+    status = _status[(qty > safety) * (1 + (qty > rop))]
 
-    lead_demand = int(math.ceil(demand * lead))
     target = rop + lead_demand
-    suggested = max(0, target - qty)
-    below_by = max(0, rop - qty)
-
-    return {
-        "reorder_point": rop,
-        "status": status,
-        "target_stock": target,
-        "suggested_reorder": suggested,
-        "below_by": below_by,
-    }
+    return _fields(rop, status, target, _max(0, target - qty), _max(0, rop - qty))
+
+
+def compute_reorder_fields_bulk(products: Sequence[Product]) -> list[ReorderFields]:
+    """
+    compute_reorder_fields() for a whole list: one array pass instead of N Python calls.
+    float64 keeps ceil() identical to the per-row version.
+    Library helper: the API routes use reorder_query(). NumPy (requirements-optional.txt)
+    is imported here, not at module level, so the API import path never loads it.
+    """
+    import numpy as np
+
+    n = len(products)
+    lead = np.fromiter((p.lead_time_days or 0 for p in products), dtype=np.int64, count=n)
+    demand = np.fromiter((p.avg_daily_demand or 0.0 for p in products), dtype=np.float64, count=n)
+    safety = np.fromiter((p.safety_stock or 0 for p in products), dtype=np.int64, count=n)
+    qty = np.fromiter((p.quantity or 0 for p in products), dtype=np.int64, count=n)
+
+    lead_demand = np.ceil(demand * lead).astype(np.int64)
+    # compute_rop(): any negative input -> 0
+    rop = np.where((lead < 0) | (demand < 0) | (safety < 0), 0, lead_demand + safety)
+    status = np.array(_STATUS, dtype=object)[(qty > safety) * (1 + (qty > rop))]
+    target = rop + lead_demand
+    suggested = np.maximum(0, target - qty)
+    below_by = np.maximum(0, rop - qty)
+
+    return list(
+        map(
+            ReorderFields._make,
+            zip(rop.tolist(), status.tolist(), target.tolist(), suggested.tolist(), below_by.tolist()),
+        )
+    )
+
+
+# ---------- SQL VERSION (same math, computed by the DB) ----------
+
+class _sql_ceil(FunctionElement):
+    """
+    CEIL() as an integer. SQLite builds without math functions have no CEIL,
+    so it is rendered there as trunc(x) + (x > trunc(x)).
+    """
+    type = Integer()
+    name = "ceil"
+    inherit_cache = True
+
+
+@compiles(_sql_ceil)
+def _compile_sql_ceil(element, compiler, **kw):
+    return "CAST(CEIL(%s) AS INTEGER)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(_sql_ceil, "sqlite")
+def _compile_sql_ceil_sqlite(element, compiler, **kw):
+    x = compiler.process(element.clauses, **kw)
+    return f"(CAST({x} AS INTEGER) + ({x} > CAST({x} AS INTEGER)))"
+
+
+def _non_negative(expr):
+    return case((expr > 0, expr), else_=0)
+
+
+def reorder_query() -> Select:
+    """
+    Active products that need reordering, with the same fields as
+    compute_reorder_fields() computed in SQL (one scan, only non-OK rows returned).
+    """
+    lead = func.coalesce(Product.lead_time_days, 0)
+    demand = func.coalesce(Product.avg_daily_demand, 0)
+
+    base = (
+        select(
+            Product.id,
+            Product.sku,
+            Product.name,
+            Product.category,
+            Product.supplier,
+            func.coalesce(Product.quantity, 0).label("quantity"),
+            lead.label("lead_time_days"),
+            demand.label("avg_daily_demand"),
+            func.coalesce(Product.safety_stock, 0).label("safety_stock"),
+            _sql_ceil(demand * lead).label("lead_demand"),
+        )
+        .where(Product.is_active == True)
+        .subquery()
+    )
+
+    qty = base.c.quantity
+    safety = base.c.safety_stock
+    rop = base.c.lead_demand + safety
+    target = rop + base.c.lead_demand
+
+    status = case(
+        (qty <= safety, "CRITICAL"),
+        (qty <= rop, "WARNING"),
+        else_="OK",
+    )
+
+    return (
+        select(
+            base.c.id,
+            base.c.sku,
+            base.c.name,
+            base.c.category,
+            base.c.supplier,
+            qty,
+            base.c.lead_time_days,
+            base.c.avg_daily_demand,
+            safety,
+            rop.label("reorder_point"),
+            status.label("status"),
+            target.label("target_stock"),
+            _non_negative(target - qty).label("suggested_reorder"),
+            _non_negative(rop - qty).label("below_by"),
+        )
+        # safety <= rop always, so this is exactly status != "OK"
+        .where(qty <= rop)
+    )
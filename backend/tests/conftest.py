@@ -0,0 +1,35 @@
+# backend/tests/conftest.py
+
+import os
+import tempfile
+
+# settings / engines are built at import time: point them at a throwaway DB first
+_DB_DIR = tempfile.mkdtemp(prefix="suppliesense-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ["JWT_SECRET_KEY"] = "test-secret-key-0123456789abcdef0123456789"
+os.environ.pop("REDIS_URL", None)
+os.environ.pop("AUDIT_BUFFER", None)
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.database import Base, engine
+from app.main import app
+from app.models import audit_log, product, user  # noqa: F401  (register tables)
+from app.seed_users import seed_users
+
+Base.metadata.create_all(bind=engine)
+seed_users()
+
+
+@pytest.fixture
+def client() -> TestClient:
+    return TestClient(app)
+
+
+@pytest.fixture
+def manager_headers(client: TestClient) -> dict:
+    # fresh token per test (logout tests revoke theirs)
+    res = client.post("/api/auth/token", data={"username": "manager", "password": "manager123"})
+    assert res.status_code == 200, res.text
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
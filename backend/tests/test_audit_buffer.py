@@ -0,0 +1,36 @@
+# backend/tests/test_audit_buffer.py
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.main import app
+from app.models.audit_log import AuditLog
+from app.models.product import Product
+
+
+def _audit_count(product_id: int) -> int:
+    with SessionLocal() as db:
+        return db.scalar(select(func.count()).select_from(AuditLog).where(AuditLog.product_id == product_id))
+
+
+def test_buffered_audit_skips_rolled_back_requests(monkeypatch, manager_headers):
+    monkeypatch.setattr(settings, "audit_buffer_enabled", True)
+
+    with SessionLocal() as db:
+        p = Product(sku="AUDIT-BUF-1", name="Audit buffer", quantity=5, is_active=True)
+        db.add(p)
+        db.commit()
+        product_id = p.id
+
+    # lifespan starts the buffer on enter and flushes it on exit
+    with TestClient(app, raise_server_exceptions=False) as c:
+        ok = c.patch(f"/api/products/{product_id}/stock", json={"quantity": 7}, headers=manager_headers)
+        assert ok.status_code == 200
+
+        # violates ck_safety_stock_non_negative at commit -> rollback after the audit row was queued
+        bad = c.patch(f"/api/products/{product_id}", json={"safety_stock": -1}, headers=manager_headers)
+        assert bad.status_code == 500
+
+    assert _audit_count(product_id) == 1
@@ -0,0 +1,45 @@
+# backend/tests/test_auth.py
+
+import asyncio
+import time
+
+import pytest
+
+from app.api import deps_auth
+from app.core.security import create_access_token
+
+
+def test_logout_revokes_token(client, manager_headers):
+    assert client.get("/api/products", headers=manager_headers).status_code == 200
+
+    res = client.post("/api/auth/logout", headers=manager_headers)
+    assert res.status_code == 200
+
+    # cached token must not outlive the logout
+    assert client.get("/api/products", headers=manager_headers).status_code == 401
+    assert client.get("/api/auth/me", headers=manager_headers).status_code == 401
+
+
+def test_revocation_reaches_warm_local_cache_on_other_worker(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    monkeypatch.setattr(deps_auth, "_redis", fakeredis.FakeAsyncRedis())
+
+    # distinct claims: a login token issued in the same second would be byte-identical
+    token = create_access_token({"sub": "1", "username": "worker-b", "name": "Worker B", "role": "viewer"})
+    key = deps_auth._token_key(token)
+
+    async def scenario():
+        # this worker verified the token recently -> local cache hit
+        await deps_auth.get_current_user(token, db=None)
+        assert key in deps_auth._TOKEN_CACHE
+
+        # logout handled by another worker: only Redis knows
+        await deps_auth._shared_revoke(key, int(time.time()) + 600)
+
+        with pytest.raises(Exception) as exc:
+            await deps_auth.get_current_user(token, db=None)
+        return exc.value
+
+    err = asyncio.run(scenario())
+    assert err.status_code == 401
+    assert key not in deps_auth._TOKEN_CACHE
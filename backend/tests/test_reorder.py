@@ -0,0 +1,38 @@
+# backend/tests/test_reorder.py
+
+import random
+
+from app.core.database import SessionLocal
+from app.models.product import Product
+from app.services.reorder import compute_reorder_fields, reorder_query
+
+FIELDS = ("reorder_point", "status", "target_stock", "suggested_reorder", "below_by")
+
+
+def test_reorder_query_matches_compute_reorder_fields():
+    rng = random.Random(7)
+    with SessionLocal() as db:
+        db.add_all(
+            Product(
+                sku=f"PARITY-{i}",
+                name=f"Parity {i}",
+                quantity=rng.choice([None, 0, 1, 3, 8, 20, 75]),
+                lead_time_days=rng.choice([None, 0, 1, 3, 7, 14, 30]),
+                avg_daily_demand=rng.choice([None, 0, 1, 2, 0.1, 1.2, 1.5, 3.7]),
+                safety_stock=rng.choice([None, 0, 2, 5, 10]),
+                is_active=rng.random() > 0.1,
+            )
+            for i in range(3000)
+        )
+        db.commit()
+
+        expected = {}
+        for p in db.query(Product).filter(Product.is_active == True):
+            fields = compute_reorder_fields(p)
+            if fields.status != "OK":
+                expected[p.id] = fields._asdict()
+
+        got = {r["id"]: {k: r[k] for k in FIELDS} for r in db.execute(reorder_query()).mappings()}
+
+    assert expected, "fixture should produce some non-OK products"
+    assert got == expected